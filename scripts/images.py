@@ -1,59 +1,64 @@
 # /// script
 # requires-python = ">=3.12"
-# dependencies = [
-#     "graphviz",
-#     "matplotlib",
-# ]
+# dependencies = []
 # ///
-import matplotlib.pyplot as plt
-import graphviz
-
-# Architecture Overview Diagram
-architecture_dot = """
-digraph architecture {
-    rankdir=LR;
-    node [shape=box style=filled fillcolor=lightgrey];
-
-    ToolRegistry [label="ToolRegistry\n(MCP Server)"];
-    ResourceRegistry [label="ResourceRegistry\n(MCP Server)"];
-    PromptRegistry [label="PromptRegistry\n(MCP Server)"];
-    McpRegistrar [label="McpRegistrar\n(MCP Server)"];
-    TaskScheduler [label="TaskScheduler\n(MCP Server)"];
-
-    ToolRegistry -> McpRegistrar [dir=both];
-    ResourceRegistry -> McpRegistrar [dir=both];
-    PromptRegistry -> McpRegistrar [dir=both];
-    TaskScheduler -> ToolRegistry [label="InvokeTool"];
-    TaskScheduler -> McpRegistrar [label="Discovery"];
-
-    McpRegistrar -> TaskScheduler [label="Registry Info"];
-}
-"""
-
-# Task Lifecycle Diagram
-lifecycle_dot = """
-digraph lifecycle {
-    rankdir=TB;
-    node [shape=box style=filled fillcolor=lightblue];
-
-    Created [label="Task Created"];
-    Scheduled [label="Scheduled or Immediate Execution"];
-    Resolved [label="Resolved Tool via ToolRegistry"];
-    Execution [label="Execution in Isolated Context"];
-    Success [label="Status: Completed"];
-    Failure [label="Status: Failed or Retry"];
-
-    Created -> Scheduled -> Resolved -> Execution;
-    Execution -> Success;
-    Execution -> Failure;
-}
-"""
-
-# Generate diagrams
-architecture_graph = graphviz.Source(architecture_dot)
-lifecycle_graph = graphviz.Source(lifecycle_dot)
-
-architecture_graph.render('public/images/mcp_architecture', format='png', cleanup=False)
-lifecycle_graph.render('public/images/task_lifecycle', format='png', cleanup=False)
-
-"public/images/mcp_architecture.png", "public/images/task_lifecycle.png"
+# Regenerates the diagrams in public/images from their committed .dot sources.
+# Run it after editing a .dot file; diagrams whose source is unchanged are skipped.
+# The rendered PNGs and their .png.sha1 sidecars are committed alongside the
+# sources, so a clean checkout is already up to date and needs no Graphviz for
+# the default format. Other formats are rendered on demand and not committed.
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# PNG is what public/images ships; set DIAGRAM_FORMATS=svg (or svg,png) for the
+# cheaper SVG output. All formats come out of a single layout pass.
+FORMATS = [fmt.strip() for fmt in os.environ.get('DIAGRAM_FORMATS', 'png').split(',') if fmt.strip()]
+
+OUTPUT_DIR = Path('public/images')
+
+
+def render(sources):
+    subprocess.run(['dot', *[f'-T{fmt}' for fmt in FORMATS], '-O', *map(str, sources)], check=True)
+    # -O names each output <name>.dot.<format>; drop the .dot to keep the published filenames
+    for source in sources:
+        for fmt in FORMATS:
+            os.replace(f'{source}.{fmt}', source.with_suffix(f'.{fmt}'))
+
+
+def is_fresh(source, fmt, digest):
+    # Each format records the source hash it was rendered from in <name>.<format>.sha1
+    try:
+        cached = source.with_suffix(f'.{fmt}.sha1').read_text().strip()
+    except FileNotFoundError:
+        return False
+    return cached == digest and source.with_suffix(f'.{fmt}').exists()
+
+
+# Only re-render diagrams whose DOT source changed since the requested formats
+# were last rendered; a stale diagram is rendered in every requested format.
+stale = []
+for source in sorted(OUTPUT_DIR.glob('*.dot')):
+    digest = hashlib.sha1(source.read_bytes()).hexdigest()
+    if not all(is_fresh(source, fmt, digest) for fmt in FORMATS):
+        stale.append((source, digest))
+
+if stale:
+    if shutil.which('dot') is None:
+        sys.exit("Graphviz 'dot' not found on PATH")
+
+    # Spread the stale diagrams over one batched `dot` process per core; the
+    # workers only wait on their subprocess, so threads are enough
+    workers = min(len(stale), os.cpu_count() or 1)
+    batches = [[source for source, _ in stale[i::workers]] for i in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(render, batches))
+
+    # Only the formats rendered in this run are marked fresh
+    for source, digest in stale:
+        for fmt in FORMATS:
+            source.with_suffix(f'.{fmt}.sha1').write_text(digest + '\n')
@@ -3,138 +3,291 @@ import argparse
 import asyncio
 import json
 import os
+import shutil
+import subprocess
 import sys
 from typing import Any, Dict, Optional
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except Exception:  # Fallback to stdlib json when orjson is not installed
+    orjson = None
+
 # Load variables from a .env file if present
 load_dotenv()
 
+# Align with Rust server expectations: OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL
+# Maintain backward compatibility by reading OPENAI_API_BASE/OPENAI_API_MODEL if set
+# Resolved once at import; only variables that are set are passed to the child
+_OPENAI_ENV = {
+    key: value
+    for key, value in (
+        ("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY")),
+        ("OPENAI_BASE_URL", os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE")),
+        ("OPENAI_MODEL", os.getenv("OPENAI_MODEL") or os.getenv("OPENAI_API_MODEL")),
+    )
+    if value
+}
+
 JSON = Dict[str, Any]
 
+# Experimental capability: after the initialize response, both sides frame messages
+# as a 4-byte little-endian length followed by the JSON body instead of a newline
+LENGTH_FRAMING_CAPABILITY = "lengthPrefixedFraming"
+
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+class MCPError(RuntimeError):
+    """JSON-RPC error response; the payload is only serialized when displayed."""
+
+    def __init__(self, payload: Any) -> None:
+        super().__init__()
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return _dumps(self.payload).decode("utf-8")
+
+
 class MCPClient:
     def __init__(self, command: str, args: list[str] | None = None, cwd: Optional[str] = None) -> None:
         self.command = command
         self.args = args or []
         self.cwd = cwd
-        # Align with Rust server expectations: OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_MODEL
-        # Maintain backward compatibility by reading OPENAI_API_BASE/OPENAI_API_MODEL if set
-        self.env = {
-            "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
-            "OPENAI_BASE_URL": os.getenv("OPENAI_BASE_URL") or os.getenv("OPENAI_API_BASE"),
-            "OPENAI_MODEL": os.getenv("OPENAI_MODEL") or os.getenv("OPENAI_API_MODEL"),
-        }
+        # Per-client copy so mutating one client's env does not leak into others
+        self.env = dict(_OPENAI_ENV)
         self.proc: Optional[asyncio.subprocess.Process] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Encoded outgoing frames; a single writer task coalesces them into one drain
+        self._tx_queue: asyncio.Queue[bytes] = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._stdout_task: Optional[asyncio.Task] = None
+        self._stderr_task: Optional[asyncio.Task] = None
         self._id = 0
         self._pending: dict[int, asyncio.Future] = {}
+        # Ids from request_raw(): their futures get the undecoded response frame
+        self._pending_raw: set[int] = set()
+        self._init_id: Optional[int] = None
+        self._length_framed = False
+        # Set once stdin is unusable; later requests fail fast instead of queueing
+        self._tx_closed = False
 
     def _next_id(self) -> int:
         self._id += 1
         return self._id
 
     async def start(self) -> None:
-        # Build environment for the child process. Only pass variables that are set
-        merged_env = dict(os.environ)
-        for key, value in (self.env or {}).items():
-            if value:
-                merged_env[key] = value
-
+        self._loop = asyncio.get_running_loop()
+        # Popen only takes its posix_spawn fast path (instead of fork+exec) when the
+        # executable has a directory component and no cwd, preexec_fn or new session
+        # is requested, so resolve bare command names against PATH up front
+        command = self.command
+        if self.cwd is None:
+            command = shutil.which(command) or command
+        if os.getenv("MCP_CLIENT_DEBUG"):
+            # Mirrors Popen's own check; the flags are private, hence getattr.
+            # close_fds=True below additionally needs POSIX_SPAWN_CLOSEFROM support.
+            posix_spawn = (
+                getattr(subprocess, "_USE_POSIX_SPAWN", False)
+                and getattr(subprocess, "_HAVE_POSIX_SPAWN_CLOSEFROM", False)
+                and os.path.dirname(command)
+                and self.cwd is None
+            )
+            print(f"[client] spawning server via {'posix_spawn' if posix_spawn else 'fork/exec'}", file=sys.stderr)
         self.proc = await asyncio.create_subprocess_exec(
-            self.command,
+            command,
             *self.args,
             stdin=asyncio.subprocess.PIPE,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=self.cwd,
-            env=merged_env,
+            env=os.environ | self.env,
+            close_fds=True,
+            start_new_session=False,
         )
-        asyncio.create_task(self._read_stdout())
-        asyncio.create_task(self._read_stderr())
+        # Keep strong references: the loop only holds weak ones, so an unreferenced
+        # reader task can be garbage-collected mid-flight
+        self._writer_task = asyncio.create_task(self._writer_loop(), name="mcp-stdin")
+        self._stdout_task = asyncio.create_task(self._read_stdout(), name="mcp-stdout")
+        self._stderr_task = asyncio.create_task(self._read_stderr(), name="mcp-stderr")
+
+    def _encode(self, payload: JSON) -> bytes:
+        body = _dumps(payload)
+        if self._length_framed:
+            return len(body).to_bytes(4, "little") + body
+        return body + b"\n"
+
+    def _next_frame(self, buf: bytearray) -> Optional[bytes]:
+        # Pop one complete message off the front of buf, or None if more data is needed
+        if self._length_framed:
+            if len(buf) < 4:
+                return None
+            end = 4 + int.from_bytes(buf[:4], "little")
+            if len(buf) < end:
+                return None
+            frame = bytes(buf[4:end])
+            del buf[:end]
+            return frame
+        newline = buf.find(b"\n")
+        if newline == -1:
+            return None
+        frame = bytes(buf[:newline])
+        del buf[: newline + 1]
+        return frame
 
     async def _read_stdout(self) -> None:
         assert self.proc and self.proc.stdout
+        # Read large chunks and split frames ourselves: fewer reads than readline(),
+        # and no 64 KiB StreamReader line limit for big responses such as tools/list
+        buf = bytearray()
         while True:
-            raw_line = await self.proc.stdout.readline()
-            if not raw_line:
+            chunk = await self.proc.stdout.read(65536)
+            if not chunk:
                 # process ended
-                # complete all pending futures with error
-                for future in self._pending.values():
-                    if not future.done():
-                        future.set_exception(RuntimeError("transport closed"))
-                self._pending.clear()
+                self._fail_pending()
                 return
+            buf.extend(chunk)
+            # Framing may switch mid-buffer (after initialize), so re-check per frame
+            while (raw_line := self._next_frame(buf)) is not None:
+                if raw_line.strip():
+                    self._handle_message(raw_line)
+
+    def _fail_pending(self) -> None:
+        # complete all pending futures with error
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("transport closed"))
+        self._pending.clear()
+        self._pending_raw.clear()
+
+    def _handle_message(self, raw_line: bytes) -> None:
+        try:
+            message = _loads(raw_line)
+        except Exception as e:
+            # ignore malformed lines but log to stderr
+            print(f"[client] failed to parse line: {raw_line!r}: {e}", file=sys.stderr)
+            return
+        # handle JSON-RPC shapes: response or error
+        if "id" in message and ("result" in message or "error" in message):
+            request_id = message.get("id")
+            if request_id == self._init_id and "result" in message:
+                # Switch framing before reading anything the server sends next
+                capabilities = message["result"].get("capabilities") or {}
+                experimental = capabilities.get("experimental") or {}
+                self._length_framed = LENGTH_FRAMING_CAPABILITY in experimental
+            future = self._pending.pop(request_id, None)
+            wants_raw = request_id in self._pending_raw
+            self._pending_raw.discard(request_id)
+            if future is not None and not future.done():
+                if "error" in message:
+                    future.set_exception(MCPError(message["error"]))
+                elif wants_raw:
+                    future.set_result(raw_line)
+                else:
+                    future.set_result(message["result"])
+        else:
+            # notifications or other messages; just print
+            print(json.dumps(message))
+
+    async def _writer_loop(self) -> None:
+        assert self.proc and self.proc.stdin
+        while True:
+            frames = [await self._tx_queue.get()]
+            while not self._tx_queue.empty():
+                frames.append(self._tx_queue.get_nowait())
             try:
-                message = json.loads(raw_line.decode("utf-8"))
-            except Exception as e:
-                # ignore malformed lines but log to stderr
-                print(f"[client] failed to parse line: {raw_line!r}: {e}", file=sys.stderr)
-                continue
-            # handle JSON-RPC shapes: response or error
-            if "id" in message and ("result" in message or "error" in message):
-                request_id = message.get("id")
-                future = self._pending.pop(request_id, None)
-                if future is not None and not future.done():
-                    if "error" in message:
-                        future.set_exception(RuntimeError(json.dumps(message["error"])) )
-                    else:
-                        future.set_result(message["result"]) 
-            else:
-                # notifications or other messages; just print
-                print(json.dumps(message))
+                self.proc.stdin.write(b"".join(frames))
+                await self.proc.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                # The server is gone: nothing queued will be sent, so fail the waiters
+                # now and drain the queue so aclose() does not wait on join()
+                self._tx_closed = True
+                self._fail_pending()
+                while not self._tx_queue.empty():
+                    self._tx_queue.get_nowait()
+                    self._tx_queue.task_done()
+                return
+            finally:
+                for _ in frames:
+                    self._tx_queue.task_done()
 
     async def _read_stderr(self) -> None:
         assert self.proc and self.proc.stderr
         log_path = "/tmp/mcp_server_stderr.log"
+        # Raw append-mode fd: server output is logged byte-for-byte, no decode/re-encode
         try:
-            log_file = open(log_path, "a", buffering=1)
-        except Exception:
-            log_file = None
+            log_fd: Optional[int] = os.open(log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        except OSError:
+            log_fd = None
         while True:
             raw_line = await self.proc.stderr.readline()
             if not raw_line:
-                if log_file:
-                    log_file.close()
+                if log_fd is not None:
+                    os.close(log_fd)
                 return
-            text_line = raw_line.decode("utf-8")
-            sys.stderr.write(f"[server-stderr] {text_line}")
-            if log_file:
+            sys.stderr.buffer.write(b"[server-stderr] " + raw_line)
+            sys.stderr.buffer.flush()
+            if log_fd is not None:
                 try:
-                    log_file.write(text_line)
-                except Exception:
+                    os.write(log_fd, raw_line)
+                except OSError:
                     pass
 
     async def request(self, method: str, params: Any) -> Any:
+        return await self._send_request(method, params)
+
+    async def request_raw(self, method: str, params: Any) -> bytes:
+        """Like request(), but return the response message as the raw JSON bytes."""
+        return await self._send_request(method, params, raw=True)
+
+    async def _send_request(self, method: str, params: Any, raw: bool = False) -> Any:
         assert self.proc and self.proc.stdin
+        if self._tx_closed:
+            raise RuntimeError("transport closed")
         request_id = self._next_id()
+        if method == "initialize":
+            self._init_id = request_id
         request_payload: JSON = {
             "jsonrpc": "2.0",
             "id": request_id,
             "method": method,
             "params": params,
         }
-        future: asyncio.Future = asyncio.get_event_loop().create_future()
+        assert self._loop is not None
+        future: asyncio.Future = self._loop.create_future()
         self._pending[request_id] = future
-        encoded_line = (json.dumps(request_payload) + "\n").encode("utf-8")
-        self.proc.stdin.write(encoded_line)
-        await self.proc.stdin.drain()
+        if raw:
+            self._pending_raw.add(request_id)
+        self._tx_queue.put_nowait(self._encode(request_payload))
         return await future
 
     async def notify(self, method: str, params: Any) -> None:
         assert self.proc and self.proc.stdin
+        if self._tx_closed:
+            raise RuntimeError("transport closed")
         notification_payload: JSON = {
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
         }
-        encoded_line = (json.dumps(notification_payload) + "\n").encode("utf-8")
-        self.proc.stdin.write(encoded_line)
-        await self.proc.stdin.drain()
+        self._tx_queue.put_nowait(self._encode(notification_payload))
 
     async def initialize(self) -> JSON:
         # Use a protocol version compatible with the rmcp server's response
         init_params: JSON = {
             "protocolVersion": "2024-11-05",
-            "capabilities": {},
+            # Servers that also advertise this switch to length-prefixed framing
+            "capabilities": {"experimental": {LENGTH_FRAMING_CAPABILITY: {}}},
             "clientInfo": {"name": "mcp-test-client", "version": "0.1.0"},
         }
         init_result = await self.request("initialize", init_params)
@@ -155,12 +308,23 @@ class MCPClient:
 
     async def aclose(self) -> None:
         if self.proc:
+            if self._writer_task:
+                # Let queued frames (e.g. trailing notifications) reach the server first
+                try:
+                    await asyncio.wait_for(self._tx_queue.join(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                self._writer_task.cancel()
             if self.proc.stdin:
                 self.proc.stdin.close()
             try:
                 await asyncio.wait_for(self.proc.wait(), timeout=1.0)
             except asyncio.TimeoutError:
                 self.proc.kill()
+            # Let the readers drain to EOF so pending futures and the log fd are settled
+            readers = [task for task in (self._stdout_task, self._stderr_task) if task]
+            if readers:
+                await asyncio.wait(readers, timeout=1.0)
 
 
 async def main() -> None:
@@ -168,6 +332,11 @@ async def main() -> None:
     parser.add_argument("--command", required=True, help="Path to MCP server executable")
     parser.add_argument("server_args", nargs=argparse.REMAINDER, help="Arguments to pass to the server after --")
     parser.add_argument("--cwd", default=None, help="Working directory for the server")
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Emit the tools/list response envelope verbatim as tools.list.response instead of re-serializing its result",
+    )
     args = parser.parse_args()
 
     # Split separator -- from remaining args if present
@@ -192,8 +361,17 @@ async def main() -> None:
         await asyncio.sleep(0.05)
 
         # First, list tools to verify dispatch after initialize; send explicit optional params
-        tools = await client.request("tools/list", {"cursor": None, "limit": None})
-        print(json.dumps({"tools.list.result": tools}, indent=2))
+        tools_params = {"cursor": None, "limit": None}
+        if not args.raw:
+            tools = await client.request("tools/list", tools_params)
+            print(json.dumps({"tools.list.result": tools}, indent=2))
+        else:
+            # Splice the server's bytes straight through instead of parse + re-dump;
+            # this is the whole JSON-RPC response, so it is labelled as such
+            raw = await client.request_raw("tools/list", tools_params)
+            sys.stdout.flush()
+            sys.stdout.buffer.write(b'{"tools.list.response":' + raw + b"}\n")
+            sys.stdout.buffer.flush()
 
         # Then, call chat tool
         call_res = await client.call_tool(
@@ -1,7 +1,7 @@
 use std::fs;
 use std::io::{self, Write};
-use std::path::PathBuf;
-use std::process::Command;
+use std::path::{Path, PathBuf};
+use std::process::{Child, Command, Stdio};
 
 use aes_gcm::aead::{Aead, KeyInit};
 use aes_gcm::{Aes256Gcm, Key, Nonce};
@@ -19,9 +19,23 @@ enum Scheme {
     Ed25519,
 }
 
+// Both printers serialize straight into a locked, buffered stdout instead of
+// building the whole JSON string first (list output grows with the keyring)
 fn print_json_compact(v: &serde_json::Value) -> anyhow::Result<()> {
-    println!("");
-    println!("{}", serde_json::to_string(v)?);
+    let mut out = io::BufWriter::new(io::stdout().lock());
+    writeln!(out)?;
+    serde_json::to_writer(&mut out, v)?;
+    writeln!(out)?;
+    out.flush()?;
+    Ok(())
+}
+
+fn print_json_pretty(v: &serde_json::Value) -> anyhow::Result<()> {
+    let mut out = io::BufWriter::new(io::stdout().lock());
+    writeln!(out)?;
+    serde_json::to_writer_pretty(&mut out, v)?;
+    writeln!(out)?;
+    out.flush()?;
     Ok(())
 }
 
@@ -118,6 +132,39 @@ struct EncParams {
     p: u32,
 }
 
+#[derive(Args, Debug, Clone)]
+struct KdfArgs {
+    /// scrypt cost parameter N for new key files (power of two, 1024..=1048576)
+    #[arg(long, default_value_t = 16384, value_parser = parse_scrypt_n)]
+    scrypt_n: u32,
+    /// Use a light KDF (N=4096) for throwaway test keys; not for production keys
+    #[arg(long, conflicts_with = "scrypt_n")]
+    kdf_fast: bool,
+}
+
+impl KdfArgs {
+    fn scrypt_n(&self) -> u32 {
+        if self.kdf_fast {
+            4096
+        } else {
+            self.scrypt_n
+        }
+    }
+}
+
+// Checked at parse time so a bad N fails before subkey runs or a password is asked for
+fn parse_scrypt_n(value: &str) -> Result<u32, String> {
+    let n: u32 = value
+        .parse()
+        .map_err(|_| format!("Invalid scrypt N '{value}'. Expected an integer"))?;
+    if !n.is_power_of_two() || !(1 << 10..=1 << 20).contains(&n) {
+        return Err(format!(
+            "Invalid scrypt N '{n}'. Expected a power of two from 1024 to 1048576"
+        ));
+    }
+    Ok(n)
+}
+
 #[derive(Parser, Debug)]
 #[command(name = "keytools", about = "Key tools for Modnet (Rust)")]
 struct Cli {
@@ -157,6 +204,8 @@ struct GenArgs {
     /// Positional base filename (sans .json) as a convenience
     #[arg()]
     input: Option<String>,
+    #[command(flatten)]
+    kdf: KdfArgs,
 }
 #[derive(Args, Debug)]
 struct GenAllArgs {
@@ -168,6 +217,8 @@ struct GenAllArgs {
     aura_name: Option<String>,
     #[arg(long)]
     grandpa_name: Option<String>,
+    #[command(flatten)]
+    kdf: KdfArgs,
 }
 #[derive(Args, Debug)]
 struct MultisigArgs {
@@ -195,6 +246,8 @@ struct KeySaveArgs {
     /// Positional base filename (sans .json) as a convenience
     #[arg()]
     input: Option<String>,
+    #[command(flatten)]
+    kdf: KdfArgs,
 }
 #[derive(Args, Debug)]
 struct KeyLoadArgs {
@@ -271,8 +324,18 @@ fn require_subkey() {
     }
 }
 
-fn run(cmd: &[&str]) -> anyhow::Result<String> {
-    let out = Command::new(cmd[0]).args(&cmd[1..]).output()?;
+fn spawn(cmd: &[&str]) -> anyhow::Result<Child> {
+    let child = Command::new(cmd[0])
+        .args(&cmd[1..])
+        .stdin(Stdio::null())
+        .stdout(Stdio::piped())
+        .stderr(Stdio::piped())
+        .spawn()?;
+    Ok(child)
+}
+
+fn wait(cmd: &[&str], child: Child) -> anyhow::Result<String> {
+    let out = child.wait_with_output()?;
     if !out.status.success() {
         anyhow::bail!(
             "{} failed: {}",
@@ -283,6 +346,10 @@ fn run(cmd: &[&str]) -> anyhow::Result<String> {
     Ok(String::from_utf8_lossy(&out.stdout).to_string())
 }
 
+fn run(cmd: &[&str]) -> anyhow::Result<String> {
+    wait(cmd, spawn(cmd)?)
+}
+
 fn parse_subkey(
     output: &str,
 ) -> (
@@ -295,36 +362,80 @@ fn parse_subkey(
     let mut seed = None;
     let mut pubhex = None;
     let mut ss58 = None;
-    for line in output.lines().map(|l| l.trim()) {
-        let l = line.to_lowercase();
-        if l.starts_with("secret phrase") {
-            phrase = line.split(':').nth(1).map(|s| s.trim().to_string());
-        } else if l.starts_with("secret seed") {
-            seed = line.split(':').nth(1).map(|s| s.trim().to_string());
-        } else if l.starts_with("public key (hex)") {
-            pubhex = line.split(':').nth(1).map(|s| s.trim().to_string());
-        } else if l.starts_with("ss58 address") {
-            ss58 = line.split(':').nth(1).map(|s| s.trim().to_string());
-        }
+    // Lines look like "Secret seed:       0x..."; match on the label only
+    for line in output.lines() {
+        let Some((label, value)) = line.split_once(':') else {
+            continue;
+        };
+        let slot = match label.trim().to_ascii_lowercase().as_str() {
+            "secret phrase" => &mut phrase,
+            "secret seed" => &mut seed,
+            "public key (hex)" => &mut pubhex,
+            "ss58 address" => &mut ss58,
+            _ => continue,
+        };
+        *slot = Some(value.trim().to_string());
     }
     (phrase, seed, pubhex, ss58)
 }
 
 fn cmd_gen(a: GenArgs) -> anyhow::Result<()> {
-    require_subkey();
     ensure_keys_dir();
-    let out = run(&[
-        "subkey",
-        "generate",
-        "--scheme",
-        a.scheme.as_str(),
-        "--network",
-        &a.network,
-    ])?;
-    let (phrase, seed, pubhex, ss58) = parse_subkey(&out);
-    let kj = KeyJson {
-        scheme: a.scheme.as_str().into(),
-        network: a.network,
+    let created_at = chrono::Utc::now().to_rfc3339();
+    let kj = subkey_generate_batch(&[a.scheme], &a.network, &created_at)?.remove(0);
+    // If positional input is provided, use it as --name when --name is absent
+    let effective_name = a.name.clone().or(a.input.clone());
+    let out_path = resolve_out(a.out, effective_name, a.scheme.as_str());
+    let password = prompt_new_password()?;
+    save_generated(&kj, &out_path, &a.kdf, &password)
+}
+
+// Generate one keypair per scheme. All `subkey generate` processes are started before
+// any is awaited, so their startup overlaps; the batch shares one created_at stamp.
+fn subkey_generate_batch(
+    schemes: &[Scheme],
+    network: &str,
+    created_at: &str,
+) -> anyhow::Result<Vec<KeyJson>> {
+    require_subkey();
+    let cmds: Vec<[&str; 6]> = schemes
+        .iter()
+        .map(|s| {
+            [
+                "subkey",
+                "generate",
+                "--scheme",
+                s.as_str(),
+                "--network",
+                network,
+            ]
+        })
+        .collect();
+    let children = cmds
+        .iter()
+        .map(|cmd| spawn(cmd))
+        .collect::<anyhow::Result<Vec<_>>>()?;
+    cmds.iter()
+        .zip(children)
+        .zip(schemes)
+        .map(|((cmd, child), scheme)| {
+            let out = wait(cmd, child)?;
+            Ok(generated_key(
+                *scheme,
+                network.to_string(),
+                &out,
+                created_at,
+            ))
+        })
+        .collect()
+}
+
+// Build the KeyJson for a freshly generated keypair from `subkey generate` output
+fn generated_key(scheme: Scheme, network: String, out: &str, created_at: &str) -> KeyJson {
+    let (phrase, seed, pubhex, ss58) = parse_subkey(out);
+    KeyJson {
+        scheme: scheme.as_str().into(),
+        network,
         byte_array: ss58
             .as_ref()
             .and_then(|s| ss58_to_bytes(s).ok())
@@ -334,23 +445,28 @@ fn cmd_gen(a: GenArgs) -> anyhow::Result<()> {
         public_key_hex: pubhex,
         private_key_hex: seed,
         ss58_address: ss58.clone(),
-        key_type: Some(a.scheme.as_str().into()),
+        key_type: Some(scheme.as_str().into()),
         is_pair: Some(true),
         is_multisig: None,
         threshold: None,
         signers: None,
         multisig_address: None,
-        created_at: Some(chrono::Utc::now().to_rfc3339()),
-    };
-    // If positional input is provided, use it as --name when --name is absent
-    let effective_name = a.name.clone().or(a.input.clone());
-    let out_path = resolve_out(a.out, effective_name, a.scheme.as_str());
-    let enc = encrypt_key(&kj)?;
-    fs::write(&out_path, serde_json::to_vec_pretty(&enc)?)?;
+        created_at: Some(created_at.to_string()),
+    }
+}
+
+fn save_generated(
+    kj: &KeyJson,
+    out_path: &PathBuf,
+    kdf: &KdfArgs,
+    password: &str,
+) -> anyhow::Result<()> {
+    let enc = encrypt_key(kj, kdf, password)?;
+    write_key_file(out_path, &enc)?;
     // Add spacing between prompt and outputs
     println!("");
     println!("Saved generated key to {}", out_path.display());
-    print_json_compact(&render_key_json(&kj))
+    print_json_compact(&render_key_json(kj))
 }
 
 fn cmd_gen_all(a: GenAllArgs) -> anyhow::Result<()> {
@@ -359,7 +475,8 @@ fn cmd_gen_all(a: GenAllArgs) -> anyhow::Result<()> {
         .out_dir
         .clone()
         .unwrap_or_else(|| keys_dir().to_string_lossy().to_string());
-    let ts = chrono::Utc::now().format("%Y%m%d-%H%M%S").to_string();
+    let now = chrono::Utc::now();
+    let ts = now.format("%Y%m%d-%H%M%S").to_string();
     // Aura filename
     let aura_path = if let Some(name) = a.aura_name.as_ref() {
         let fname = if name.ends_with(".json") {
@@ -383,41 +500,28 @@ fn cmd_gen_all(a: GenAllArgs) -> anyhow::Result<()> {
         format!("{}/{}-grandpa-ed25519.json", base_dir, ts)
     };
 
-    let a1 = GenArgs {
-        scheme: Scheme::Sr25519,
-        network: a.network.clone(),
-        out: Some(aura_path),
-        name: None,
-        input: None,
-    };
-    let a2 = GenArgs {
-        scheme: Scheme::Ed25519,
-        network: a.network.clone(),
-        out: Some(grandpa_path),
-        name: None,
-        input: None,
-    };
-    cmd_gen(a1)?;
-    cmd_gen(a2)?;
+    ensure_keys_dir();
+    // The two keypairs are independent, so both `subkey generate` processes run at once
+    let keys = subkey_generate_batch(
+        &[Scheme::Sr25519, Scheme::Ed25519],
+        &a.network,
+        &now.to_rfc3339(),
+    )?;
+    let [aura, grandpa]: [KeyJson; 2] = keys
+        .try_into()
+        .map_err(|_| anyhow::anyhow!("expected two generated keys"))?;
+    // One password protects both files, so ask for it once
+    let password = prompt_new_password()?;
+    save_generated(&aura, &PathBuf::from(aura_path), &a.kdf, &password)?;
+    save_generated(&grandpa, &PathBuf::from(grandpa_path), &a.kdf, &password)?;
     Ok(())
 }
 
 // get: SAFE, does not decrypt files. Accepts SS58 or 0x public key and prints public info (optionally a field)
 fn cmd_get(a: GetArgs) -> anyhow::Result<()> {
-    // If --public-key provided, use subkey to derive SS58 (public-only)
+    // If --public-key provided, derive SS58 (public-only)
     if let Some(public_hex) = a.public_key.as_ref() {
-        require_subkey();
-        let out = run(&[
-            "subkey",
-            "inspect",
-            "--network",
-            &a.network,
-            "--public",
-            "--scheme",
-            a.scheme.as_str(),
-            public_hex,
-        ])?;
-        let (_phrase, _seed, pubhex, ss58) = parse_subkey(&out);
+        let (pubhex, ss58) = inspect_public(public_hex, a.scheme.as_str(), &a.network)?;
         let kj = KeyJson {
             scheme: a.scheme.as_str().into(),
             network: a.network,
@@ -563,24 +667,22 @@ fn cmd_get(a: GetArgs) -> anyhow::Result<()> {
 }
 
 fn cmd_multisig(a: MultisigArgs) -> anyhow::Result<()> {
-    let mut signers_hex: Vec<Vec<u8>> = Vec::new();
-    for s in &a.signer {
-        let pk = ss58_to_bytes(s)?;
-        signers_hex.push(pk.to_vec());
-    }
-    signers_hex.sort();
-    let mut hasher = Blake2b512::new();
-    hasher.update(b"modlpy/utilisig");
-    for pk in &signers_hex {
+    // ss58_to_bytes already yields the raw account id; keep it as a fixed-size array
+    let mut signers: Vec<[u8; 32]> = a
+        .signer
+        .iter()
+        .map(|s| ss58_to_bytes(s))
+        .collect::<anyhow::Result<_>>()?;
+    signers.sort_unstable();
+    let mut hasher = Blake2b512::new_with_prefix(MULTISIG_PREFIX);
+    for pk in &signers {
         hasher.update(pk);
     }
     hasher.update(a.threshold.to_le_bytes());
     let account_id: [u8; 32] = hasher.finalize()[..32].try_into().unwrap();
     let address = ss58_encode(&account_id, a.ss58_prefix);
     let out = serde_json::json!({"threshold":a.threshold,"ss58_prefix":a.ss58_prefix,"account_id_hex":hex::encode(account_id),"ss58_address":address,"signers":a.signer});
-    println!("");
-    println!("{}", serde_json::to_string_pretty(&out)?);
-    Ok(())
+    print_json_pretty(&out)
 }
 
 // helper to print either a single field or the whole JSON for safe get
@@ -622,8 +724,9 @@ fn cmd_key_save(a: KeySaveArgs) -> anyhow::Result<()> {
     // Allow positional input to act as --name if not provided
     let effective_name = a.name.clone().or(a.input.clone());
     let out_path = resolve_out(a.out.clone(), effective_name, a.scheme.as_str());
-    let enc = encrypt_key(&kj)?;
-    fs::write(&out_path, serde_json::to_vec_pretty(&enc)?)?;
+    let password = prompt_new_password()?;
+    let enc = encrypt_key(&kj, &a.kdf, &password)?;
+    write_key_file(&out_path, &enc)?;
     println!("");
     println!("Saved encrypted key to {}", out_path.display());
     println!("");
@@ -643,15 +746,7 @@ fn cmd_key_load(a: KeyLoadArgs) -> anyhow::Result<()> {
         keys_dir().join(fname)
     } else {
         // interactive select like cmd_select
-        ensure_keys_dir();
-        let mut rows: Vec<_> = fs::read_dir(keys_dir())?
-            .filter_map(|e| e.ok())
-            .filter(|e| {
-                e.path().is_file() && e.path().extension().map(|x| x == "json").unwrap_or(false)
-            })
-            .map(|e| e.path())
-            .collect();
-        rows.sort();
+        let rows = list_key_files()?;
         if rows.is_empty() {
             println!("{{}}");
             return Ok(());
@@ -675,15 +770,7 @@ fn cmd_key_load(a: KeyLoadArgs) -> anyhow::Result<()> {
 }
 
 fn cmd_list() -> anyhow::Result<()> {
-    ensure_keys_dir();
-    let mut rows: Vec<_> = fs::read_dir(keys_dir())?
-        .filter_map(|e| e.ok())
-        .filter(|e| {
-            e.path().is_file() && e.path().extension().map(|x| x == "json").unwrap_or(false)
-        })
-        .map(|e| e.path())
-        .collect();
-    rows.sort();
+    let rows = list_key_files()?;
     let items: Vec<_> = rows
         .iter()
         .enumerate()
@@ -692,21 +779,11 @@ fn cmd_list() -> anyhow::Result<()> {
         )
         .collect();
     let out = serde_json::json!({"keys_dir":keys_dir(),"items":items});
-    println!("");
-    println!("{}", serde_json::to_string_pretty(&out)?);
-    Ok(())
+    print_json_pretty(&out)
 }
 
 fn cmd_select(a: SelectArgs) -> anyhow::Result<()> {
-    ensure_keys_dir();
-    let mut rows: Vec<_> = fs::read_dir(keys_dir())?
-        .filter_map(|e| e.ok())
-        .filter(|e| {
-            e.path().is_file() && e.path().extension().map(|x| x == "json").unwrap_or(false)
-        })
-        .map(|e| e.path())
-        .collect();
-    rows.sort();
+    let rows = list_key_files()?;
     if rows.is_empty() {
         println!("{{}}");
         return Ok(());
@@ -734,6 +811,45 @@ fn cmd_select(a: SelectArgs) -> anyhow::Result<()> {
     print_json_compact(&result)
 }
 
+// Key files in keys_dir(), sorted by name. The entry's file type comes from the
+// directory listing itself, so only symlinks need an extra stat.
+fn list_key_files() -> anyhow::Result<Vec<PathBuf>> {
+    ensure_keys_dir();
+    let mut rows = Vec::new();
+    for entry in fs::read_dir(keys_dir())? {
+        let Ok(entry) = entry else { continue };
+        let path = entry.path();
+        if path.extension().map(|x| x != "json").unwrap_or(true) {
+            continue;
+        }
+        let is_file = match entry.file_type() {
+            Ok(ft) if ft.is_symlink() => path.is_file(),
+            Ok(ft) => ft.is_file(),
+            Err(_) => false,
+        };
+        if is_file {
+            rows.push(path);
+        }
+    }
+    rows.sort();
+    Ok(rows)
+}
+
+// Write the key file through a temp file in the same directory and rename it into
+// place, so an interrupted write never leaves a truncated key behind
+fn write_key_file(path: &Path, enc: &EncBlobV1) -> anyhow::Result<()> {
+    let data = serde_json::to_vec_pretty(enc)?;
+    let dir = match path.parent() {
+        Some(p) if !p.as_os_str().is_empty() => p,
+        _ => Path::new("."),
+    };
+    let mut tmp = tempfile::NamedTempFile::new_in(dir)?;
+    tmp.write_all(&data)?;
+    tmp.as_file().sync_all()?;
+    tmp.persist(path)?;
+    Ok(())
+}
+
 fn resolve_out(out: Option<String>, name: Option<String>, scheme: &str) -> PathBuf {
     if let Some(p) = out {
         return PathBuf::from(p);
@@ -814,18 +930,7 @@ fn from_phrase(phrase: &str, scheme: &str, network: &str) -> anyhow::Result<KeyJ
 }
 
 fn from_public(public: &str, scheme: &str, network: &str) -> anyhow::Result<KeyJson> {
-    require_subkey();
-    let out = run(&[
-        "subkey",
-        "inspect",
-        "--network",
-        network,
-        "--public",
-        "--scheme",
-        scheme,
-        public,
-    ])?;
-    let (_ph, seed, pubh, ss58) = parse_subkey(&out);
+    let (pubh, ss58) = inspect_public(public, scheme, network)?;
     Ok(KeyJson {
         scheme: scheme.into(),
         network: network.into(),
@@ -836,7 +941,7 @@ fn from_public(public: &str, scheme: &str, network: &str) -> anyhow::Result<KeyJ
         mnemonic_phrase: None,
         secret_phrase: None,
         public_key_hex: pubh,
-        private_key_hex: seed,
+        private_key_hex: None,
         ss58_address: ss58,
         key_type: Some("ss58".into()),
         is_pair: Some(false),
@@ -848,12 +953,56 @@ fn from_public(public: &str, scheme: &str, network: &str) -> anyhow::Result<KeyJ
     })
 }
 
-fn encrypt_key(kj: &KeyJson) -> anyhow::Result<EncBlobV1> {
-    let payload = serde_json::to_vec(kj)?;
-    let mut salt = [0u8; 16];
-    rand::thread_rng().fill_bytes(&mut salt);
-    let params = Params::new(14, 8, 1, 32)?; // N=2^14 = 16384, r=8, p=1
-                                             // We prompt user for password interactively
+// SS58 address prefixes for the well-known `--network` names; others are left to subkey
+fn network_ss58_prefix(network: &str) -> Option<u8> {
+    match network {
+        "polkadot" => Some(0),
+        "kusama" => Some(2),
+        "substrate" => Some(42),
+        _ => None,
+    }
+}
+
+// In-process (public key hex, SS58 address) for a 32-byte hex key on a known
+// network; None means the caller has to fall back to `subkey inspect`.
+fn encode_public(public: &str, network: &str) -> Option<(String, String)> {
+    let s = if public.starts_with("0x") || public.starts_with("0X") {
+        &public[2..]
+    } else {
+        public
+    };
+    let prefix = network_ss58_prefix(network)?;
+    let pk = <[u8; 32]>::try_from(hex::decode(s).ok()?.as_slice()).ok()?;
+    Some((format!("0x{}", hex::encode(pk)), ss58_encode(&pk, prefix)))
+}
+
+// Resolve (public key hex, SS58 address) for a public key. A 32-byte hex key on a
+// known network is encoded in-process; anything else goes through `subkey inspect`.
+fn inspect_public(
+    public: &str,
+    scheme: &str,
+    network: &str,
+) -> anyhow::Result<(Option<String>, Option<String>)> {
+    if let Some((pubhex, ss58)) = encode_public(public, network) {
+        return Ok((Some(pubhex), Some(ss58)));
+    }
+    require_subkey();
+    let out = run(&[
+        "subkey",
+        "inspect",
+        "--network",
+        network,
+        "--public",
+        "--scheme",
+        scheme,
+        public,
+    ])?;
+    let (_ph, _seed, pubh, ss58) = parse_subkey(&out);
+    Ok((pubh, ss58))
+}
+
+// We prompt user for password interactively
+fn prompt_new_password() -> anyhow::Result<String> {
     eprint!("Set password for key file: ");
     io::stderr().flush().ok();
     let pw1 = read_line_hidden()?;
@@ -863,27 +1012,30 @@ fn encrypt_key(kj: &KeyJson) -> anyhow::Result<EncBlobV1> {
     if pw1 != pw2 {
         anyhow::bail!("Passwords do not match")
     }
+    Ok(pw1)
+}
+
+fn encrypt_key(kj: &KeyJson, kdf: &KdfArgs, password: &str) -> anyhow::Result<EncBlobV1> {
+    let payload = serde_json::to_vec(kj)?;
+    // Draw salt (16 bytes) and nonce (12 bytes) from the RNG in one call
+    let mut random = [0u8; 28];
+    rand::thread_rng().fill_bytes(&mut random);
+    let (salt, nonce) = random.split_at(16);
+    let n = kdf.scrypt_n();
+    // Params::new takes log2(N); r=8, p=1
+    let params = Params::new(n.trailing_zeros() as u8, 8, 1, 32)?;
     let mut key = [0u8; 32];
-    scrypt::scrypt(pw1.as_bytes(), &salt, &params, &mut key)?;
-    let nonce = {
-        let mut n = [0u8; 12];
-        rand::thread_rng().fill_bytes(&mut n);
-        n
-    };
+    scrypt::scrypt(password.as_bytes(), salt, &params, &mut key)?;
     let cipher = Aes256Gcm::new(Key::<Aes256Gcm>::from_slice(&key));
     let ct = cipher
-        .encrypt(Nonce::from_slice(&nonce), payload.as_ref())
+        .encrypt(Nonce::from_slice(nonce), payload.as_ref())
         .map_err(|e| anyhow::anyhow!(e.to_string()))?;
     Ok(EncBlobV1 {
         version: 1,
         kdf: "scrypt".into(),
-        salt: general_purpose::STANDARD.encode(&salt),
-        params: EncParams {
-            n: 16384,
-            r: 8,
-            p: 1,
-        },
-        nonce: general_purpose::STANDARD.encode(&nonce),
+        salt: general_purpose::STANDARD.encode(salt),
+        params: EncParams { n, r: 8, p: 1 },
+        nonce: general_purpose::STANDARD.encode(nonce),
         ciphertext: general_purpose::STANDARD.encode(&ct),
         // store public metadata for safe reads
         scheme: Some(kj.scheme.clone()),
@@ -932,6 +1084,10 @@ fn decrypt_key(blob: &EncBlobV1, password_opt: Option<&str>) -> anyhow::Result<K
     Ok(kj)
 }
 
+const SS58_PREFIX: &[u8] = b"SS58PRE";
+// Multisig account ids are the first 32 bytes of Blake2b-512, not Blake2b-256
+const MULTISIG_PREFIX: &[u8] = b"modlpy/utilisig";
+
 fn ss58_to_bytes(addr: &str) -> anyhow::Result<[u8; 32]> {
     let data = bs58::decode(addr).into_vec()?;
     if data.len() != 35 {
@@ -939,10 +1095,9 @@ fn ss58_to_bytes(addr: &str) -> anyhow::Result<[u8; 32]> {
     }
     let pubkey = &data[1..33];
     let checksum = &data[33..35];
-    let mut h = Blake2b512::new();
-    h.update(b"SS58PRE");
-    h.update(&data[..33]);
-    let out = h.finalize();
+    let out = Blake2b512::new_with_prefix(SS58_PREFIX)
+        .chain_update(&data[..33])
+        .finalize();
     if &out[..2] != checksum {
         anyhow::bail!("invalid SS58 checksum")
     }
@@ -955,12 +1110,91 @@ fn ss58_encode(account_id: &[u8; 32], addr_type: u8) -> String {
     let mut data = Vec::with_capacity(35);
     data.push(addr_type);
     data.extend_from_slice(account_id);
-    let mut h = Blake2b512::new();
-    h.update(b"SS58PRE");
-    h.update(&data);
-    let out = h.finalize();
-    let cs = &out[..2];
-    let mut full = data.clone();
-    full.extend_from_slice(cs);
-    bs58::encode(full).into_string()
+    let out = Blake2b512::new_with_prefix(SS58_PREFIX)
+        .chain_update(&data)
+        .finalize();
+    data.extend_from_slice(&out[..2]);
+    bs58::encode(data).into_string()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    // Well-known Alice sr25519 dev account; addresses match `subkey inspect --public`
+    const ALICE: &str = "0xd43593c715fdd31c61141abd04a99fd6822c8558854ccde39a5684e7a56da27d";
+
+    #[test]
+    fn encode_public_matches_subkey_addresses() {
+        for (network, address) in [
+            (
+                "substrate",
+                "5GrwvaEF5zXb26Fz9rcQpDWS57CtERHpNehXCPcNoHGKutQY",
+            ),
+            (
+                "polkadot",
+                "15oF4uVJwmo4TdGW7VfQxNLavjCXviqxT9S1MgbjMNHr6Sp5",
+            ),
+            ("kusama", "HNZata7iMYWmk5RvZRTiAsSDhV8366zq2YGb3tLH5Upf74F"),
+        ] {
+            let (pubhex, ss58) = encode_public(ALICE, network).unwrap();
+            assert_eq!(pubhex, ALICE);
+            assert_eq!(ss58, address);
+            assert_eq!(
+                ss58_to_bytes(&ss58).unwrap().to_vec(),
+                hex::decode(&ALICE[2..]).unwrap()
+            );
+        }
+        // The 0x prefix is optional and case-insensitive
+        let bare = encode_public(&ALICE[2..].to_uppercase(), "substrate").unwrap();
+        assert_eq!(bare.0, ALICE);
+    }
+
+    #[test]
+    fn encode_public_falls_back_to_subkey() {
+        // Not hex (e.g. an SS58 address or a dev URI)
+        assert!(encode_public(
+            "5GrwvaEF5zXb26Fz9rcQpDWS57CtERHpNehXCPcNoHGKutQY",
+            "substrate"
+        )
+        .is_none());
+        assert!(encode_public("//Alice", "substrate").is_none());
+        // Hex, but not 32 bytes
+        assert!(encode_public(&ALICE[..ALICE.len() - 2], "substrate").is_none());
+        assert!(encode_public(&format!("{ALICE}00"), "substrate").is_none());
+        // Networks without a known prefix
+        assert!(encode_public(ALICE, "westend").is_none());
+    }
+
+    #[test]
+    fn parse_subkey_reads_generate_output() {
+        // Captured from `subkey generate --scheme sr25519` (the well-known dev phrase);
+        // "Public key (SS58)" must not be mistaken for the "SS58 Address" line
+        let out = "\
+Secret phrase:       bottom drive obey lake curtain smoke basket hold race lonely fit walk
+  Network ID:        substrate
+  Secret seed:       0xfac7959dbfe72f052e5a0c3c8d6530f202b02fd8f9f5ca3580ec8deb7797479e
+  Public key (hex):  0x46ebddef8cd9bb167dc30878d7113b7e168e6f0646beffd77d69d39bad76b47a
+  Account ID:        0x46ebddef8cd9bb167dc30878d7113b7e168e6f0646beffd77d69d39bad76b47a
+  Public key (SS58): 5DfhGyQdFobKM8NsWvEeAKk5EQQgYe9AydgJ7rMB6E1EqRzV
+  SS58 Address:      5DfhGyQdFobKM8NsWvEeAKk5EQQgYe9AydgJ7rMB6E1EqRzV
+";
+        let (phrase, seed, pubhex, ss58) = parse_subkey(out);
+        assert_eq!(
+            phrase.as_deref(),
+            Some("bottom drive obey lake curtain smoke basket hold race lonely fit walk")
+        );
+        assert_eq!(
+            seed.as_deref(),
+            Some("0xfac7959dbfe72f052e5a0c3c8d6530f202b02fd8f9f5ca3580ec8deb7797479e")
+        );
+        assert_eq!(
+            pubhex.as_deref(),
+            Some("0x46ebddef8cd9bb167dc30878d7113b7e168e6f0646beffd77d69d39bad76b47a")
+        );
+        assert_eq!(
+            ss58.as_deref(),
+            Some("5DfhGyQdFobKM8NsWvEeAKk5EQQgYe9AydgJ7rMB6E1EqRzV")
+        );
+    }
 }
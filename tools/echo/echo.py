@@ -1,24 +1,37 @@
 #!/usr/bin/env python3
+import os
 import sys
 import json
 
-def main():
-    line = sys.stdin.readline()
-    if not line:
-        print(json.dumps({"content": [{"type": "text", "text": ""}], "isError": True}))
-        return
+def emit(obj):
+    # Runs under plain python3 (no uv), so stick to stdlib json but skip print()'s text layer
+    sys.stdout.buffer.write(json.dumps(obj, separators=(",", ":")).encode("utf-8") + b"\n")
+    sys.stdout.buffer.flush()
+
+def handle(line):
     try:
         payload = json.loads(line)
     except Exception as e:
-        print(json.dumps({"content": [{"type": "text", "text": f"invalid JSON: {e}"}], "isError": True}))
-        return
+        return {"content": [{"type": "text", "text": f"invalid JSON: {e}"}], "isError": True}
 
     args = payload.get("arguments", {})
     text = args.get("text", "")
 
     # Emit MCP-native content array with text
-    out = {"content": [{"type": "text", "text": text}], "isError": False}
-    print(json.dumps(out, separators=(",", ":")))
+    return {"content": [{"type": "text", "text": text}], "isError": False}
+
+def main():
+    # Serve one JSON line per request until stdin closes, so a caller can keep the
+    # process alive across calls; ECHO_ONESHOT=1 restores the single-request mode
+    oneshot = os.environ.get("ECHO_ONESHOT") == "1"
+    handled = False
+    for line in iter(sys.stdin.buffer.readline, b""):
+        emit(handle(line))
+        handled = True
+        if oneshot:
+            break
+    if not handled:
+        emit({"content": [{"type": "text", "text": ""}], "isError": True})
 
 if __name__ == "__main__":
     main()
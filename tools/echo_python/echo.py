@@ -1,42 +1,45 @@
 # /// script
 # requires-python = ">=3.10"
-# dependencies = []
+# dependencies = ["orjson"]
 # ///
 
+import os
 import sys
-import json
 
-try:
-    import orjson
-except Exception:  # Fallback if orjson is not available; uv should resolve it though
-    orjson = None
+import orjson
 
 
-def to_json_line(obj):
-    if orjson is not None:
-        return orjson.dumps(obj).decode()
-    return json.dumps(obj, separators=(",", ":"))
+def emit(obj):
+    # orjson produces UTF-8 bytes; write them as-is instead of going through print()
+    sys.stdout.buffer.write(orjson.dumps(obj) + b"\n")
+    sys.stdout.buffer.flush()
 
 
-def main():
-    line = sys.stdin.readline()
-    if not line:
-        print(to_json_line({"isError": True, "error": "no input"}))
-        return
+def handle(line):
     try:
-        payload = json.loads(line)
+        payload = orjson.loads(line)
     except Exception as e:
-        print(to_json_line({"isError": True, "error": f"invalid JSON: {e}"}))
-        return
+        return {"isError": True, "error": f"invalid JSON: {e}"}
 
     args = payload.get("arguments", {})
     text = args.get("text", "")
 
     # Perform the tool work
-    result = {"echo": text}
+    return {"echo": text}
+
 
-    # Emit a single JSON line result
-    print(to_json_line(result))
+def main():
+    # Serve one JSON line per request until stdin closes, so a caller can keep the
+    # process alive across calls; ECHO_ONESHOT=1 restores the single-request mode
+    oneshot = os.environ.get("ECHO_ONESHOT") == "1"
+    handled = False
+    for line in iter(sys.stdin.buffer.readline, b""):
+        emit(handle(line))
+        handled = True
+        if oneshot:
+            break
+    if not handled:
+        emit({"isError": True, "error": "no input"})
 
 
 if __name__ == "__main__":